@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from typing import Callable, Optional, List, TypedDict
 
@@ -8,14 +9,18 @@ from astrbot.core.config.astrbot_config import AstrBotConfig
 from astrbot.core.message.components import BaseMessageComponent, Plain
 from astrbot.core.message.message_event_result import MessageChain
 from astrbot.core.platform.astr_message_event import AstrMessageEvent
-from .util import AsyncHttpUtil, CronSchedulerUtil
-from .util import image_util
+from .util import AsyncHttpUtil, CalendarStore, CronSchedulerUtil, FeedWatcher
+from .util import LocalCoordinator, SqliteCoordinator
+from .util import image_util, theme_util
+
+
+DAILY_INFO_KEYS = ("date", "week", "war", "battle", "orecar", "school", "rescue", "luck", "draw", "team")  # 日常图片所需字段
+CELEBS_NAMES = ("楚天社", "云从社", "披风会")  # 侠行事件名称
 
 
 class SchedulerStatus(TypedDict):
     """用于存储部分定时任务状态"""
     last_server_status: Optional[dict]  # 上一次服务器状态
-    last_skill_info_id: Optional[str]  # 上一次技改信息id
 
 
 @register("jx3", "MiaoToT", "剑三 API", "1.0")
@@ -31,14 +36,21 @@ class Jx3Plugin(Star):
         }
         self._scheduler_status: SchedulerStatus = {  # 用于存储部分定时任务状态
             "last_server_status": None,
-            "last_skill_info_id": None,
         }
+        self._feed_watcher = FeedWatcher()  # 列表类接口增量检测
         self._host = config["host"]  # 剑三 API 调用域名
         self._subscriber = config["subscriber"]  # 定时任务需要发送的群组
-        self._scheduler = CronSchedulerUtil()
+        self._default_theme = theme_util.resolve_theme(config["theme"])  # 未单独设置主题的群组使用的主题
+        self._calendar_store = CalendarStore()  # 日历本地缓存
+        self._calendar_lock = asyncio.Lock()  # 日历缓存未命中时只发起一次请求，并发请求等待其结果
+        # 多实例协调：指向同一数据库文件的实例共享定时任务锁与状态，未配置时仅本实例使用
+        db_path = config["coordination_db"]
+        self._coordinator = SqliteCoordinator(db_path) if db_path else LocalCoordinator()
+        self._scheduler = CronSchedulerUtil(self._coordinator)
         # self._scheduler.add_task(self.server_on_status, "*/20 8-18 * * *")  # 开服检测
         # self._scheduler.add_task(self.server_off_status, "0 5 * * *")  # 维护检测
         self._scheduler.add_task(self.skill_info, "0 12 * * *")  # 技改公告查询
+        self._scheduler.add_task(self.announce_info, "0 12 * * *")  # 维护公告查询
 
     @filter.command_group("剑三")
     def jx3(self):
@@ -51,9 +63,11 @@ class Jx3Plugin(Star):
     @filter.permission_type(filter.PermissionType.MEMBER)
     async def daily(self, event: AstrMessageEvent):
         """预测今天的日常任务"""
-        yield await self.result_handler("/data/active/calendar",
-                                        lambda data: [image_util.daily_info_image(data)],
-                                        event, {"num": 0})
+        data = await self._get_daily_data(event)
+        if data is None:
+            return
+        theme = await self._get_theme(event)
+        yield await self._send_result(data, lambda d: [image_util.daily_info_image(d, theme)], event)
 
     @jx3.command("日历")
     @filter.llm_tool(name="jx3_calendar")
@@ -61,9 +75,11 @@ class Jx3Plugin(Star):
     @filter.permission_type(filter.PermissionType.MEMBER)
     async def calendar(self, event: AstrMessageEvent):
         """预测前后共7天的日常任务"""
-        yield await self.result_handler("/data/active/list/calendar",
-                                        lambda data: [image_util.calender_image(data)],
-                                        event, {"num": 7})
+        data = await self._get_calendar_data(event)
+        if data is None:
+            return
+        theme = await self._get_theme(event)
+        yield await self._send_result(data, lambda d: [image_util.calender_image(d, theme)], event)
 
     @jx3.command("楚天社", alias={"云从社", "披风会"})
     @filter.llm_tool(name="jx3_celebs")
@@ -71,10 +87,29 @@ class Jx3Plugin(Star):
     @filter.permission_type(filter.PermissionType.MEMBER)
     async def celebs(self, event: AstrMessageEvent):
         """获取侠行事件|楚天社,云从社,披风会"""
+        theme = await self._get_theme(event)
         yield await self.result_handler("/data/active/celebs",
-                                        lambda data: [image_util.schedule_image(data)],
+                                        lambda data: [image_util.schedule_image(data, theme)],
                                         event, {"name": event.get_message_str().split(" ")[1]})
 
+    @jx3.command("汇总")
+    @filter.llm_tool(name="jx3_summary")
+    @filter.event_message_type(filter.EventMessageType.ALL)
+    @filter.permission_type(filter.PermissionType.MEMBER)
+    async def summary(self, event: AstrMessageEvent):
+        """日常与楚天社,云从社,披风会汇总到一张图片"""
+        # 并发请求各分区数据，单个分区失败时跳过该分区
+        daily, *celebs = await asyncio.gather(
+            self._get_daily_data(),
+            *(self._request_data("/data/active/celebs", params={"name": name}) for name in CELEBS_NAMES)
+        )
+        schedules = [(name, data) for name, data in zip(CELEBS_NAMES, celebs) if data is not None]
+        if daily is None and not schedules:
+            await self._return_error_msg(event)
+            return
+        theme = await self._get_theme(event)
+        yield await self._send_result(schedules, lambda d: [image_util.summary_image(daily, d, theme)], event)
+
     @jx3.command("令牌")
     @filter.llm_tool(name="jx3_renew_ticket")
     @filter.event_message_type(filter.EventMessageType.ALL)
@@ -86,26 +121,32 @@ class Jx3Plugin(Star):
         self._api_params["ticket"] = ticket
         yield event.plain_result("更新成功")
 
+    @jx3.command("主题")
+    @filter.llm_tool(name="jx3_theme")
+    @filter.event_message_type(filter.EventMessageType.ALL)
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    async def theme(self, event: AstrMessageEvent, name: str = ""):
+        """设置当前群组的图片主题，不带参数时列出可用主题"""
+        if name not in theme_util.THEMES:
+            current = await self._get_theme(event)
+            yield event.plain_result(f"当前主题: {current}\n可用主题: {', '.join(theme_util.theme_names())}")
+            return
+        group_themes = await self._coordinator.get_state("group_themes") or {}
+        group_themes[event.unified_msg_origin] = name
+        await self._coordinator.set_state("group_themes", group_themes)
+        yield event.plain_result("更新成功")
+
     async def skill_info(self):
         """技改信息"""
+        await self.feed_handler("/data/skills/records", lambda item: f"{item['title']}:\n{item['url']}")
 
-        def data_handler(data: dict) -> List[BaseMessageComponent]:
-            api_skill_id = data[0]["id"]
-            if self._scheduler_status["last_skill_info_id"] == api_skill_id:
-                return []
-            is_init = self._scheduler_status["last_skill_info_id"] is None  # 是否第一次初始化
-            self._scheduler_status["last_skill_info_id"] = api_skill_id
-            # 第一次初始化不发送消息
-            if is_init:
-                return []
-            skill_title = data[0]["title"]
-            skill_url = data[0]["url"]
-            return [Plain(f"{skill_title}:\n{skill_url}")]
-
-        await self.result_handler("/data/skills/records", data_handler)
+    async def announce_info(self):
+        """维护公告"""
+        await self.feed_handler("/data/news/announce", lambda item: f"{item['title']}:\n{item['url']}")
 
     async def server_on_status(self):
         """开服检测:每天8-18点20分钟一次检测直到开服"""
+        await self._load_scheduler_status()
         last_status = self._scheduler_status["last_server_status"]
         # 检测状态为开服则不再进行检测
         if last_status is not None and last_status["status"] == 1:
@@ -126,6 +167,7 @@ class Jx3Plugin(Star):
             return [Plain(f"{server_name} 在{time}开服啦 ε(*′･∀･｀)зﾞ")]
 
         await self.result_handler("/data/server/check", data_handler)
+        await self._save_scheduler_status()
 
     async def server_off_status(self):
         """维护检测:每天早上5点检测一次"""
@@ -138,6 +180,7 @@ class Jx3Plugin(Star):
             return []
 
         await self.result_handler("/data/server/check", data_handler)
+        await self._save_scheduler_status()
 
     async def result_handler(
             self,
@@ -154,6 +197,52 @@ class Jx3Plugin(Star):
             event (AstrMessageEvent): 消息事件
             params (Optional[dict]): 变化部分请求参数
         """
+        data = await self._request_data(path_name, event, params)
+        if data is None:
+            return None
+        await self._send_result(data, success_handler, event)
+        return None
+
+    async def feed_handler(
+            self,
+            path_name: str,
+            item_formatter: Callable[[dict], str],
+            params: Optional[dict] = None
+    ) -> None:
+        """列表类接口增量推送，依次推送上次检测后新增的所有条目
+
+        Args:
+            path_name (str): 路径名
+            item_formatter (Callable[[dict], str]): 单个条目转换为消息文本的函数
+            params (Optional[dict]): 变化部分请求参数
+        """
+        data = await self._request_data(path_name, params=params)
+        if data is None:
+            return None
+        state_key = f"feed:{path_name}"
+        self._feed_watcher.load(path_name, await self._coordinator.get_state(state_key))
+        new_items = self._feed_watcher.update(path_name, data)
+        await self._coordinator.set_state(state_key, self._feed_watcher.dump(path_name))
+        for item in new_items:
+            await self._send_result(item, lambda d: [Plain(item_formatter(d))])
+        return None
+
+    async def _request_data(
+            self,
+            path_name: str,
+            event: AstrMessageEvent = None,
+            params: Optional[dict] = None
+    ) -> Optional[dict]:
+        """请求接口数据，失败时返回错误信息
+
+        Args:
+            path_name (str): 路径名
+            event (AstrMessageEvent): 消息事件
+            params (Optional[dict]): 变化部分请求参数
+
+        Returns:
+            Optional[dict]: 接口返回的 data 部分，失败返回None
+        """
         try:
             http_result = await AsyncHttpUtil.post(self._get_url(path_name), self._get_params(params))
         except Exception as e:
@@ -161,18 +250,36 @@ class Jx3Plugin(Star):
             await self._return_error_msg(event)
             return None
 
+        if http_result is None:
+            await self._return_error_msg(event)
+            return None
+
         if http_result["code"] != 200:
             logger.warning(f"API请求返回结果异常：{http_result['msg']}")
             await self._return_error_msg(event, http_result['msg'])
             return None
+        return http_result["data"]
+
+    async def _send_result(
+            self,
+            data: dict,
+            success_handler: Callable[[dict], List[BaseMessageComponent]],
+            event: AstrMessageEvent = None
+    ) -> None:
+        """处理数据并发送消息
 
+        Args:
+            data (dict): 接口返回的 data 部分
+            success_handler (Callable[[dict], Awaitable[List[BaseMessageComponent]]): 处理数据的函数
+            event (AstrMessageEvent): 消息事件
+        """
         try:
-            data = success_handler(http_result["data"])  # 根据回调方法处理数据
+            result = success_handler(data)  # 根据回调方法处理数据
             # 数据为空不发送消息
-            if not data:
+            if not result:
                 return None
             result_msg_chain = MessageChain()
-            result_msg_chain.chain.extend(data)
+            result_msg_chain.chain.extend(result)
             # event存在代表是指令触发，否则是定时任务触发，定时任务触发则给所有指定的群组发消息
             groups = self._subscriber if event is None else [event.unified_msg_origin]
             for group_id in groups:
@@ -182,6 +289,96 @@ class Jx3Plugin(Star):
             await self._return_error_msg(event)
         return None
 
+    async def _get_daily_data(self, event: AstrMessageEvent = None) -> Optional[dict]:
+        """获取今天的日常数据，优先使用日历缓存
+
+        Args:
+            event (AstrMessageEvent): 消息事件
+
+        Returns:
+            Optional[dict]: 剑三日常信息 json，失败返回None
+        """
+        return await self._get_cached_calendar(
+            lambda: self._calendar_store.get_today(DAILY_INFO_KEYS),
+            "/data/active/calendar", {"num": 0}, self._calendar_store.merge_day, event
+        )
+
+    async def _get_calendar_data(self, event: AstrMessageEvent = None) -> Optional[dict]:
+        """获取前后共7天的日历数据，优先使用日历缓存
+
+        Args:
+            event (AstrMessageEvent): 消息事件
+
+        Returns:
+            Optional[dict]: 剑三日历 json，失败返回None
+        """
+        return await self._get_cached_calendar(
+            self._calendar_store.get_window,
+            "/data/active/list/calendar", {"num": 7}, self._calendar_store.merge_window, event
+        )
+
+    async def _get_cached_calendar(
+            self,
+            lookup: Callable[[], Optional[dict]],
+            path_name: str,
+            params: dict,
+            merge: Callable[[dict], None],
+            event: AstrMessageEvent = None
+    ) -> Optional[dict]:
+        """读取日历缓存，未命中时请求接口并合并到缓存
+
+        缓存未命中时加锁并再次检查，并发的未命中请求只会触发一次接口调用
+
+        Args:
+            lookup (Callable[[], Optional[dict]]): 从缓存读取数据的函数
+            path_name (str): 路径名
+            params (dict): 变化部分请求参数
+            merge (Callable[[dict], None]): 将接口数据合并到缓存的函数
+            event (AstrMessageEvent): 消息事件
+
+        Returns:
+            Optional[dict]: 缓存或接口数据，失败返回None
+        """
+        self._calendar_store.load(await self._coordinator.get_state("calendar"))
+        data = lookup()
+        if data is not None:
+            return data
+        async with self._calendar_lock:
+            # 等待锁期间其他请求可能已经完成更新
+            self._calendar_store.load(await self._coordinator.get_state("calendar"))
+            data = lookup()
+            if data is not None:
+                return data
+            data = await self._request_data(path_name, event, params)
+            if data is None:
+                return None
+            merge(data)
+            await self._coordinator.set_state("calendar", self._calendar_store.dump())
+        return data
+
+    async def _get_theme(self, event: AstrMessageEvent) -> str:
+        """获取群组设置的图片主题
+
+        Args:
+            event (AstrMessageEvent): 消息事件
+
+        Returns:
+            str: 主题名称
+        """
+        group_themes = await self._coordinator.get_state("group_themes") or {}
+        return theme_util.resolve_theme(group_themes.get(event.unified_msg_origin, self._default_theme))
+
+
+    async def _load_scheduler_status(self) -> None:
+        """从协调后端读取定时任务状态"""
+        status = await self._coordinator.get_state("scheduler_status")
+        if status is not None:
+            self._scheduler_status.update(status)
+
+    async def _save_scheduler_status(self) -> None:
+        """将定时任务状态写入协调后端"""
+        await self._coordinator.set_state("scheduler_status", dict(self._scheduler_status))
+
     async def _return_error_msg(self, event: AstrMessageEvent = None, error_msg: str = None) -> None:
         """错误信息返回
 
@@ -0,0 +1,333 @@
+"""插件压测工具
+
+在 AstrBot 根目录执行：
+    python -m data.plugins.astrbot_plugin_jx3.tools.load_test --groups 500 --window 60
+"""
+import argparse
+import asyncio
+import random
+import resource
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from astrbot.core.message.components import Image
+from data.plugins.astrbot_plugin_jx3.main import Jx3Plugin
+from data.plugins.astrbot_plugin_jx3.util import AsyncHttpUtil
+
+COMMANDS = {  # 指令 -> (处理方法名, 消息文本)
+    "日常": ("daily", "剑三 日常"),
+    "日历": ("calendar", "剑三 日历"),
+    "楚天社": ("celebs", "剑三 楚天社"),
+    "云从社": ("celebs", "剑三 云从社"),
+    "披风会": ("celebs", "剑三 披风会"),
+    "汇总": ("summary", "剑三 汇总"),
+}
+
+
+class FakeConfig(dict):
+    """模拟 AstrBotConfig"""
+
+    def save_config(self) -> None:
+        pass
+
+
+class FakeContext:
+    """模拟 Context，按会话记录发送的消息"""
+
+    def __init__(self):
+        self.sent: Dict[str, list] = defaultdict(list)  # 会话 -> 消息组件列表(每条消息一项)
+
+    async def send_message(self, session, message_chain) -> bool:
+        self.sent[session].append(list(message_chain.chain))
+        return True
+
+    def is_success(self, session: str) -> bool:
+        """判断会话的回复是否成功：至少回复一条消息且每条都包含图片，错误提示为纯文本
+
+        Args:
+            session (str): 会话
+
+        Returns:
+            bool: 是否成功
+        """
+        messages = self.sent.get(session)
+        return bool(messages) and all(
+            any(isinstance(component, Image) for component in message) for message in messages
+        )
+
+
+class FakeEvent:
+    """模拟 AstrMessageEvent，只实现插件用到的属性和方法"""
+
+    def __init__(self, session_id: str, message_str: str):
+        self.unified_msg_origin = f"aiocqhttp:GroupMessage:{session_id}"
+        self.message_str = message_str
+
+    def get_message_str(self) -> str:
+        return self.message_str
+
+    def plain_result(self, text: str) -> str:
+        return text
+
+
+class MockJx3Api:
+    """本地模拟剑三 API，按路径统计调用次数"""
+
+    def __init__(self, latency: float, day_offset: int = 0):
+        """
+        Args:
+            latency (float): 每次请求的模拟延迟(秒)
+            day_offset (int): 接口返回日期相对北京时间当天的偏移，用于模拟上游换日时间与本机不一致
+        """
+        self.latency = latency
+        self.day_offset = day_offset
+        self.calls: Counter = Counter()  # 路径 -> 调用次数
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> str:
+        """启动服务
+
+        Returns:
+            str: 服务地址
+        """
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        port = self._runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        """停止服务"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        path = "/" + request.match_info["path"]
+        self.calls[path] += 1
+        await asyncio.sleep(self.latency)
+        params = await request.post()
+        return web.json_response({"code": 200, "msg": "success", "data": self._data(path, params)})
+
+    def _day(self, offset: int) -> dict:
+        """生成单天日常数据
+
+        Args:
+            offset (int): 相对当天的偏移
+
+        Returns:
+            dict: 单天日常数据
+        """
+        day = datetime.now(timezone(timedelta(hours=8))).date() + timedelta(days=self.day_offset + offset)
+        return {
+            "date": day.strftime("%Y-%m-%d"),
+            "week": "一二三四五六日"[day.weekday()],
+            "war": "英雄范阳夜变",
+            "battle": "九宫棋谷",
+            "orecar": "跨服•烂柯山",
+            "school": "门派事件",
+            "rescue": "龙门荒漠",
+            "luck": ["阿甘", "南海", "葛伦"],
+            "draw": "测试美人图",
+            "team": ["公共一;公共二", "五人一;五人二", "十人一;十人二"],
+        }
+
+    def _data(self, path: str, params) -> object:
+        if path == "/data/active/calendar":
+            return self._day(0)
+        if path == "/data/active/list/calendar":
+            return {"today": self._day(0), "data": [self._day(offset) for offset in range(-2, 5)]}
+        if path == "/data/active/celebs":
+            return [
+                {"map": "地图", "site": f"地点{i}", "time": f"{i:02d}:00", "stage": "阶段",
+                 "desc": f"{params.get('name', '')}测试描述" * 3}
+                for i in range(8)
+            ]
+        return [{"id": str(i), "title": f"公告{i}", "url": "https://jx3.xoyo.com"} for i in range(10)]
+
+
+async def _monitor_loop_lag(lags: List[float], interval: float, stop: asyncio.Event) -> None:
+    """记录事件循环延迟：sleep 实际耗时与预期之差
+
+    Args:
+        lags (List[float]): 延迟记录(秒)
+        interval (float): 采样间隔(秒)
+        stop (asyncio.Event): 停止信号
+    """
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def _run_command(
+        plugin: Jx3Plugin, context: FakeContext, command: str, session_id: str,
+        latencies: Dict[str, List[float]], failures: Counter, crashes: Dict[str, Counter], samples: Dict[str, str]
+) -> None:
+    """执行一次指令并记录耗时与结果
+
+    Args:
+        plugin (Jx3Plugin): 插件实例
+        context (FakeContext): 模拟 Context
+        command (str): 指令名
+        session_id (str): 会话id(每次请求唯一，用于区分回复)
+        latencies (Dict[str, List[float]]): 指令 -> 耗时记录(秒)
+        failures (Counter): 指令 -> 错误回复次数(插件捕获异常后回复的错误文本)
+        crashes (Dict[str, Counter]): 指令 -> 异常类型 -> 未捕获异常次数
+        samples (Dict[str, str]): 异常类型 -> 首次出现的异常信息
+    """
+    method_name, message_str = COMMANDS[command]
+    event = FakeEvent(session_id, message_str)
+    start = time.perf_counter()
+    try:
+        async for _ in getattr(plugin, method_name)(event):
+            pass
+    except Exception as e:
+        error_name = type(e).__name__
+        crashes[command][error_name] += 1
+        samples.setdefault(error_name, repr(e))
+        return
+    finally:
+        latencies[command].append(time.perf_counter() - start)
+    # 插件内部捕获异常后回复错误文本，因此按回复内容判断是否成功
+    if not context.is_success(event.unified_msg_origin):
+        failures[command] += 1
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """计算百分位数
+
+    Args:
+        values (List[float]): 数据
+        percent (float): 百分位(0-100)
+
+    Returns:
+        float: 百分位数
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _format_ms(values: List[float]) -> str:
+    """格式化耗时统计
+
+    Args:
+        values (List[float]): 耗时记录(秒)
+
+    Returns:
+        str: p50/p90/p99/max(毫秒)
+    """
+    return "p50={:.1f} p90={:.1f} p99={:.1f} max={:.1f} ms".format(
+        *(value * 1000 for value in (
+            _percentile(values, 50), _percentile(values, 90), _percentile(values, 99), max(values, default=0.0)
+        ))
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """执行压测
+
+    Args:
+        args (argparse.Namespace): 命令行参数
+    """
+    random.seed(args.seed)
+    # tracemalloc 会显著拖慢分配，影响延迟与吞吐，仅在需要分析内存时开启
+    if args.trace_memory:
+        tracemalloc.start()
+    mem_start = tracemalloc.get_traced_memory()[0]
+
+    mock_api = MockJx3Api(args.upstream_latency, args.upstream_day_offset)
+    host = await mock_api.start()
+    context = FakeContext()
+    config = FakeConfig(
+        server="乾坤一掷", token="", ticket="", host=host, subscriber=[], theme="default",
+        coordination_db=args.coordination_db,
+    )
+    plugin = Jx3Plugin(context, config)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(lags, args.lag_interval, stop))
+
+    # 按泊松过程生成请求：每个群在窗口内随机发起指令
+    commands = [command.strip() for command in args.commands.split(",")]
+    total = args.groups * args.per_group
+    rate = total / args.window
+    latencies: Dict[str, List[float]] = {command: [] for command in commands}
+    failures: Counter = Counter()
+    crashes: Dict[str, Counter] = defaultdict(Counter)
+    samples: Dict[str, str] = {}
+    tasks = []
+    start = time.perf_counter()
+    for index in range(total):
+        session_id = f"{index % args.groups}-{index}"
+        tasks.append(asyncio.create_task(
+            _run_command(
+                plugin, context, random.choice(commands), session_id, latencies, failures, crashes, samples
+            )
+        ))
+        await asyncio.sleep(random.expovariate(rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    mem_current, mem_peak = tracemalloc.get_traced_memory()
+    if args.trace_memory:
+        tracemalloc.stop()
+    await plugin._scheduler.stop()
+    await AsyncHttpUtil.close()
+    await mock_api.stop()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    errors = sum(failures.values())
+    crashed = sum(sum(counter.values()) for counter in crashes.values())
+    print(f"请求数: {total}  错误回复: {errors}  异常: {crashed}  耗时: {elapsed:.2f}s  "
+          f"吞吐: {(len(all_latencies) - errors - crashed) / elapsed:.1f} 成功req/s")
+    print(f"发送消息: {sum(len(messages) for messages in context.sent.values())}")
+    print(f"整体延迟: {_format_ms(all_latencies)}")
+    for command, values in latencies.items():
+        crash_info = ", ".join(f"{name}x{count}" for name, count in crashes[command].most_common())
+        print(f"  {command}({len(values)}, 错误回复{failures[command]}, 异常{sum(crashes[command].values())}"
+              f"{' ' + crash_info if crash_info else ''}): {_format_ms(values)}")
+    if samples:
+        print("异常示例:")
+        for name, message in samples.items():
+            print(f"  {name}: {message}")
+    print(f"事件循环延迟: {_format_ms(lags)}")
+    print(f"上游调用: {sum(mock_api.calls.values())}")
+    for path, count in mock_api.calls.most_common():
+        print(f"  {path}: {count}")
+    # ru_maxrss 在 Linux 下单位为 KiB
+    print(f"RSS峰值: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+    if args.trace_memory:
+        print(f"内存增长: {(mem_current - mem_start) / 2 ** 20:.2f} MiB  峰值: {mem_peak / 2 ** 20:.2f} MiB"
+              "  (已开启 tracemalloc，延迟与吞吐数据仅供参考)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="剑三插件压测")
+    parser.add_argument("--groups", type=int, default=500, help="群组数")
+    parser.add_argument("--per-group", type=int, default=1, help="每个群组发送的指令数")
+    parser.add_argument("--window", type=float, default=60, help="全部请求到达的时间窗口(秒)")
+    parser.add_argument("--commands", default=",".join(COMMANDS), help="参与压测的指令，逗号分隔")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="模拟 API 延迟(秒)")
+    parser.add_argument("--upstream-day-offset", type=int, default=0, help="模拟 API 返回日期的偏移(天)")
+    parser.add_argument("--lag-interval", type=float, default=0.05, help="事件循环延迟采样间隔(秒)")
+    parser.add_argument("--coordination-db", default="", help="协调数据库路径，默认仅使用内存")
+    parser.add_argument("--trace-memory", action="store_true", help="开启 tracemalloc 统计内存增长(会影响耗时数据)")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
+from data.plugins.astrbot_plugin_jx3.util.calendar_util import (
+    CalendarStore
+)
+from data.plugins.astrbot_plugin_jx3.util.coord_util import (
+    Coordinator, LocalCoordinator, SqliteCoordinator
+)
+from data.plugins.astrbot_plugin_jx3.util.feed_util import (
+    FeedWatcher
+)
 from data.plugins.astrbot_plugin_jx3.util.http_util import (
     AsyncHttpUtil
 )
 from data.plugins.astrbot_plugin_jx3.util.image_util import (
-    calender_image, schedule_image, daily_info_image
+    calender_image, schedule_image, daily_info_image, summary_image
 )
 
 from data.plugins.astrbot_plugin_jx3.util.job_util import (
     CronSchedulerUtil
 )
 
-__all__ = ["AsyncHttpUtil", "calender_image", "CronSchedulerUtil"]
+__all__ = [
+    "AsyncHttpUtil", "CalendarStore", "calender_image", "Coordinator", "CronSchedulerUtil", "FeedWatcher",
+    "LocalCoordinator", "SqliteCoordinator"
+]
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class CalendarStore:
+    """剑三日历本地缓存，按日期合并接口返回的数据
+
+    日期均以接口返回为准，缓存在每个刷新时间点(北京时间)后失效
+    """
+
+    _tz = timezone(timedelta(hours=8))  # 游戏服务器时区
+
+    def __init__(self, refresh_hours: Tuple[int, ...] = (0, 7)):
+        """
+        Args:
+            refresh_hours (Tuple[int, ...]): 每日缓存失效时间(北京时间，小时)，默认覆盖零点换日与7点刷新
+        """
+        self._refresh_hours = sorted(refresh_hours)
+        self._days: Dict[str, dict] = {}  # 日期 -> 当天日常数据
+        self._fetched: Dict[str, str] = {}  # 日期 -> 数据获取时所在的刷新周期
+        self._today: Optional[str] = None  # 接口返回的当天日期
+        self._today_period: Optional[str] = None  # 获取当天日期时所在的刷新周期
+        self._window_dates: List[str] = []  # 接口返回的日历窗口日期
+        self._window_period: Optional[str] = None  # 获取日历窗口时所在的刷新周期
+
+    def current_period(self) -> str:
+        """获取当前刷新周期(最近一个已过的刷新时间点)
+
+        Returns:
+            str: 刷新周期开始时间
+        """
+        now = datetime.now(self._tz)
+        for hour in reversed(self._refresh_hours):
+            start = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+            if start <= now:
+                return start.isoformat()
+        # 当天第一个刷新时间点之前，属于前一天最后一个周期
+        start = now.replace(hour=self._refresh_hours[-1], minute=0, second=0, microsecond=0) - timedelta(days=1)
+        return start.isoformat()
+
+    def dump(self) -> dict:
+        """导出缓存内容，用于多实例共享
+
+        Returns:
+            dict: 可JSON序列化的缓存内容
+        """
+        return {
+            "days": self._days,
+            "fetched": self._fetched,
+            "today": self._today,
+            "today_period": self._today_period,
+            "window_dates": self._window_dates,
+            "window_period": self._window_period,
+        }
+
+    def load(self, state: Optional[dict]) -> None:
+        """导入缓存内容，覆盖本地缓存
+
+        Args:
+            state (Optional[dict]): dump 导出的缓存内容，None 表示不覆盖
+        """
+        if not state:
+            return
+        self._days = state["days"]
+        self._fetched = state["fetched"]
+        self._today = state["today"]
+        self._today_period = state["today_period"]
+        self._window_dates = state["window_dates"]
+        self._window_period = state["window_period"]
+
+    def merge_window(self, data: dict) -> None:
+        """合并日历接口(/data/active/list/calendar)返回的数据
+
+        Args:
+            data (dict): 剑三日历 json
+        """
+        period = self.current_period()
+        self._today = data["today"]["date"]
+        self._today_period = period
+        self._window_dates = [item["date"] for item in data["data"]]
+        self._window_period = period
+        for item in data["data"]:
+            self._merge(item, period)
+        self._evict(period)
+
+    def merge_day(self, data: dict) -> None:
+        """合并日常接口(/data/active/calendar)返回的数据
+
+        Args:
+            data (dict): 剑三日常信息 json
+        """
+        period = self.current_period()
+        self._today = data["date"]
+        self._today_period = period
+        self._merge(data, period)
+        self._evict(period)
+
+    def get_window(self) -> Optional[dict]:
+        """从缓存中获取日历窗口
+
+        Returns:
+            Optional[dict]: 与日历接口格式一致的数据，窗口过期或有缺失的日期时返回None
+        """
+        period = self.current_period()
+        if self._window_period != period or self._today_period != period:
+            return None
+        items = [self._get_day(day, period) for day in self._window_dates]
+        today_item = self._get_day(self._today, period)
+        if today_item is None or any(item is None for item in items):
+            return None
+        return {
+            "today": {"date": today_item["date"], "week": today_item["week"]},
+            "data": items,
+        }
+
+    def get_today(self, required_keys: Iterable[str] = ()) -> Optional[dict]:
+        """从缓存中获取当天的数据
+
+        Args:
+            required_keys (Iterable[str]): 必须包含的字段，缺失时视为未缓存
+
+        Returns:
+            Optional[dict]: 当天数据，缺失或过期时返回None
+        """
+        period = self.current_period()
+        if self._today_period != period:
+            return None
+        item = self._get_day(self._today, period)
+        if item is None or any(key not in item for key in required_keys):
+            return None
+        return item
+
+    def _get_day(self, day: str, period: str) -> Optional[dict]:
+        """获取当前刷新周期内缓存的单天数据
+
+        Args:
+            day (str): 日期
+            period (str): 当前刷新周期
+
+        Returns:
+            Optional[dict]: 单天数据，缺失或过期时返回None
+        """
+        if self._fetched.get(day) != period:
+            return None
+        return self._days.get(day)
+
+    def _merge(self, item: dict, period: str) -> None:
+        """按日期合并单天数据，同一天已有字段会被新数据覆盖
+
+        Args:
+            item (dict): 单天日常数据
+            period (str): 当前刷新周期
+        """
+        day = item["date"]
+        # 过期数据直接丢弃，避免旧字段混入
+        if self._fetched.get(day) != period:
+            self._days[day] = {}
+        self._days[day].update(item)
+        self._fetched[day] = period
+
+    def _evict(self, period: str) -> None:
+        """清理已过期的日期
+
+        Args:
+            period (str): 当前刷新周期
+        """
+        for day in [day for day, fetched in self._fetched.items() if fetched != period]:
+            self._days.pop(day, None)
+            del self._fetched[day]
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class Coordinator(ABC):
+    """多实例协调后端：任务租约锁 + 共享状态"""
+
+    @abstractmethod
+    async def try_acquire(self, key: str, ttl: float) -> bool:
+        """尝试获取租约，同一时刻只有一个实例能获取成功
+
+        Args:
+            key (str): 租约名
+            ttl (float): 租约有效期(秒)
+
+        Returns:
+            bool: 是否获取成功
+        """
+
+    @abstractmethod
+    async def get_state(self, key: str) -> Optional[Any]:
+        """读取共享状态
+
+        Args:
+            key (str): 状态名
+
+        Returns:
+            Optional[Any]: 状态值，不存在返回None
+        """
+
+    @abstractmethod
+    async def set_state(self, key: str, value: Any) -> None:
+        """写入共享状态
+
+        Args:
+            key (str): 状态名
+            value (Any): 状态值(需可JSON序列化)
+        """
+
+
+class LocalCoordinator(Coordinator):
+    """单实例内存协调(不与其他实例共享)"""
+
+    def __init__(self):
+        self._leases: Dict[str, float] = {}  # 租约名 -> 过期时间
+        self._states: Dict[str, Any] = {}  # 状态名 -> 状态值
+
+    async def try_acquire(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        # 清理过期租约，定时任务每次触发的租约名都不同
+        for expired in [name for name, expires in self._leases.items() if expires <= now]:
+            del self._leases[expired]
+        if key in self._leases:
+            return False
+        self._leases[key] = now + ttl
+        return True
+
+    async def get_state(self, key: str) -> Optional[Any]:
+        return self._states.get(key)
+
+    async def set_state(self, key: str, value: Any) -> None:
+        self._states[key] = value
+
+
+class SqliteCoordinator(Coordinator):
+    """基于 SQLite 文件的多实例协调，多个实例指向同一个数据库文件即可共享"""
+
+    _busy_timeout = 5  # 数据库锁等待时间 5s
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): 数据库文件路径
+        """
+        self._db_path = db_path
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"  # 当前实例标识
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS lease (key TEXT PRIMARY KEY, owner TEXT, expires REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        finally:
+            conn.close()
+
+    async def try_acquire(self, key: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self._try_acquire, key, ttl)
+
+    async def get_state(self, key: str) -> Optional[Any]:
+        row = await asyncio.to_thread(self._execute, "SELECT value FROM state WHERE key = ?", (key,))
+        return json.loads(row[0]) if row else None
+
+    async def set_state(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, ensure_ascii=False)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """创建数据库连接
+
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        return sqlite3.connect(self._db_path, timeout=self._busy_timeout, isolation_level=None)
+
+    def _execute(self, sql: str, params: Tuple) -> Optional[Tuple]:
+        """执行单条语句
+
+        Args:
+            sql (str): SQL 语句
+            params (Tuple): 参数
+
+        Returns:
+            Optional[Tuple]: 第一行结果
+        """
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchone()
+        finally:
+            conn.close()
+
+    def _try_acquire(self, key: str, ttl: float) -> bool:
+        """在写事务中检查并写入租约，保证多进程下的互斥
+
+        Args:
+            key (str): 租约名
+            ttl (float): 租约有效期(秒)
+
+        Returns:
+            bool: 是否获取成功
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM lease WHERE expires <= ?", (now,))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO lease (key, owner, expires) VALUES (?, ?, ?)", (key, self._owner, now + ttl)
+            )
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
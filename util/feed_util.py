@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class FeedWatcher:
+    """列表类接口增量检测，按 feed 记录已推送条目"""
+
+    def __init__(self, id_key: str = "id", history_size: int = 200):
+        """
+        Args:
+            id_key (str): 条目唯一标识字段
+            history_size (int): 每个 feed 最多记录的已推送条目数
+        """
+        self._id_key = id_key
+        self._history_size = history_size
+        self._seen: Dict[str, OrderedDict] = {}  # feed -> 已推送条目id(按推送顺序)
+
+    def dump(self, feed: str) -> Optional[List[str]]:
+        """导出 feed 的已推送条目id，用于多实例共享
+
+        Args:
+            feed (str): feed 名称
+
+        Returns:
+            Optional[List[str]]: 已推送条目id(按推送顺序)，未初始化返回None
+        """
+        seen = self._seen.get(feed)
+        return None if seen is None else list(seen)
+
+    def load(self, feed: str, ids: Optional[List[str]]) -> None:
+        """导入 feed 的已推送条目id，覆盖本地记录
+
+        Args:
+            feed (str): feed 名称
+            ids (Optional[List[str]]): 已推送条目id(按推送顺序)，None 表示不覆盖
+        """
+        if ids is not None:
+            self._seen[feed] = OrderedDict.fromkeys(ids)
+
+    def update(self, feed: str, items: List[dict]) -> List[dict]:
+        """合并接口返回的最新列表，返回新增条目
+
+        Args:
+            feed (str): feed 名称
+            items (List[dict]): 接口返回的列表(最新的在前)
+
+        Returns:
+            List[dict]: 新增条目(按发布时间从旧到新)，第一次初始化返回空列表
+        """
+        is_init = feed not in self._seen  # 是否第一次初始化
+        seen = self._seen.setdefault(feed, OrderedDict())
+        new_items = []
+        for item in reversed(items):
+            item_id = str(item[self._id_key])
+            if item_id in seen:
+                # 仍在返回列表中的条目移到末尾，保证裁剪时优先淘汰已不再返回的条目
+                seen.move_to_end(item_id)
+                continue
+            seen[item_id] = None
+            new_items.append(item)
+        # 只保留最近的记录，但至少保留本次返回的全部条目，避免旧条目被重复推送
+        while len(seen) > max(self._history_size, len(items)):
+            seen.popitem(last=False)
+        # 第一次初始化不推送
+        if is_init:
+            return []
+        return new_items
@@ -1,12 +1,15 @@
 import io
 import math
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
 import astrbot.api.message_components as comp
 from astrbot.api import logger
 from astrbot.core.message.components import BaseMessageComponent
+from .theme_util import DEFAULT_THEME, get_colors, get_theme
 
 
 def _load_font(font_size: int) -> ImageFont:
@@ -44,16 +47,96 @@ def _get_image_result(img: Image) -> BaseMessageComponent:
     return comp.Image.fromBytes(buffer.getvalue())
 
 
-def calender_image(data: dict) -> BaseMessageComponent:
+def _get_background(theme: str, size: Tuple[int, int], default_bg: str) -> Image:
+    """生成主题背景画布，渐变与水印均为整图运算
+
+    只缓存与画布尺寸无关的渐变蒙版和水印，避免按尺寸缓存整张画布占用内存
+
+    Args:
+        theme: 主题名称
+        size: 画布尺寸
+        default_bg: 图片自带背景色，主题未配置背景时使用
+
+    Returns:
+        Image: 背景画布
+    """
+    config = get_theme(theme)
+    if config["bg"] is None:
+        img = Image.new("RGB", size, default_bg)
+    else:
+        start, end = config["bg"]
+        mask = _gradient_mask(config["direction"]).resize(size, Image.BILINEAR)
+        img = Image.composite(Image.new("RGB", size, end), Image.new("RGB", size, start), mask)
+
+    # 右下角半透明水印
+    if config["watermark"]:
+        tile = _watermark_tile(config["watermark"], max(size[1] // 20, 14))
+        img.paste(tile, (size[0] - tile.width - 10, size[1] - tile.height - 10), tile)
+    return img
+
+
+def _new_canvas(theme: str, size: Tuple[int, int], default_bg: str, transparent: bool) -> Image:
+    """创建画布
+
+    Args:
+        theme: 主题名称
+        size: 画布尺寸
+        default_bg: 图片自带背景色
+        transparent: 是否使用透明背景
+
+    Returns:
+        Image: 画布，透明背景时为 RGBA
+    """
+    if transparent:
+        return Image.new("RGBA", size, (0, 0, 0, 0))
+    return _get_background(theme, size, default_bg)
+
+
+@lru_cache(maxsize=2)
+def _gradient_mask(direction: str) -> Image:
+    """获取 256x256 的灰度渐变蒙版
+
+    Args:
+        direction: 渐变方向 vertical(上->下) / horizontal(左->右)
+
+    Returns:
+        Image: 渐变蒙版(缓存对象，不可直接修改)
+    """
+    mask = Image.linear_gradient("L")
+    if direction == "horizontal":
+        mask = mask.transpose(Image.ROTATE_90)
+    return mask
+
+
+@lru_cache(maxsize=16)
+def _watermark_tile(text: str, font_size: int) -> Image:
+    """获取半透明水印图块
+
+    Args:
+        text: 水印文字
+        font_size: 字号
+
+    Returns:
+        Image: RGBA 水印图块(缓存对象，不可直接修改)
+    """
+    font = _load_font(font_size)
+    _, _, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).textbbox((0, 0), text, font=font)
+    tile = Image.new("RGBA", (max(right, 1), max(bottom, 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(tile).text((0, 0), text, fill=(0, 0, 0, 40), font=font)
+    return tile
+
+
+def calender_image(data: dict, theme: str = DEFAULT_THEME) -> BaseMessageComponent:
     """剑三日历图片
 
     Args:
         data: 剑三日历 json
+        theme: 主题名称
 
     Returns:
         BaseMessageComponent: 返回图片消息
     """
-    default_colors = {
+    default_colors = get_colors(theme, "calendar", {
         "bg": "#F0F8FF",  # 背景
         "card_bg": "#FFFFFF",  # 卡片底色
         "border": "#87CEEB",  # 边框
@@ -62,7 +145,7 @@ def calender_image(data: dict) -> BaseMessageComponent:
         "label": "#338EF7",  # 标签
         "content": "#99C7FB",  # 正文
         "highlight": "#FF69B4"  # 特殊掉落
-    }
+    })
     # 初始化画布
     card_width = 200  # 卡片宽
     card_margin = 15  # 卡片外边距
@@ -75,7 +158,7 @@ def calender_image(data: dict) -> BaseMessageComponent:
     canvas_height = rows * card_height + (rows + 1) * card_margin  # 画布高度
 
     # 创建画布
-    img = Image.new("RGB", (canvas_width, canvas_height), default_colors["bg"])
+    img = _get_background(theme, (canvas_width, canvas_height), default_colors["bg"])
     ImageDraw.Draw(img)
 
     # 加载字体
@@ -91,8 +174,8 @@ def calender_image(data: dict) -> BaseMessageComponent:
         x = card_margin + col * (card_width + card_margin)  # 卡片 x 坐标
         y = card_margin + row * (card_height + card_margin)  # 卡片 y 坐标
 
-        # 创建卡片画布
-        card = Image.new("RGB", (card_width, card_height), default_colors["bg"])
+        # 创建卡片画布(截取对应位置的背景，保证圆角外与背景一致)
+        card = img.crop((x, y, x + card_width, y + card_height))
         card_draw = ImageDraw.Draw(card)
 
         # 如果是当天使用 select_border，否则使用 border
@@ -141,16 +224,31 @@ def calender_image(data: dict) -> BaseMessageComponent:
     return _get_image_result(img)
 
 
-def daily_info_image(data: dict) -> BaseMessageComponent:
+def daily_info_image(data: dict, theme: str = DEFAULT_THEME) -> BaseMessageComponent:
     """剑三日常信息图片
 
     Args:
         data: 剑三日常信息 json
+        theme: 主题名称
 
     Returns:
         BaseMessageComponent: 返回图片消息
     """
-    default_colors = {
+    return _get_image_result(_draw_daily_info(data, theme))
+
+
+def _draw_daily_info(data: dict, theme: str = DEFAULT_THEME, transparent: bool = False) -> Image:
+    """绘制剑三日常信息画布
+
+    Args:
+        data: 剑三日常信息 json
+        theme: 主题名称
+        transparent: 是否使用透明背景(合并到其他画布时由外层绘制背景)
+
+    Returns:
+        Image: 画布
+    """
+    default_colors = get_colors(theme, "daily", {
         "bg": "#F5F5F5",  # 改为浅灰色背景
         "card_bg": "#FFFEF6",  # 改为暖白色卡背
         "border": "#2A5CAA",  # 深蓝色边框增强对比
@@ -158,7 +256,7 @@ def daily_info_image(data: dict) -> BaseMessageComponent:
         "label": "#228B22",  # 绿色标签增加色彩对比
         "content": "#4682B4",  # 钢蓝色正文
         "highlight": "#FF4500"  # 橙色高亮加强视觉焦点
-    }
+    })
 
     # 卡片尺寸参数
     card_width = 430
@@ -173,7 +271,7 @@ def daily_info_image(data: dict) -> BaseMessageComponent:
     canvas_height = card_height + card_margin * 2
 
     # 创建画布
-    img = Image.new("RGB", (canvas_width, canvas_height), default_colors["bg"])
+    img = _new_canvas(theme, (canvas_width, canvas_height), default_colors["bg"], transparent)
     ImageDraw.Draw(img)
 
     # 创建卡片
@@ -254,13 +352,27 @@ def daily_info_image(data: dict) -> BaseMessageComponent:
     # 合成最终图片
     img.paste(card, (card_margin, card_margin))
 
-    return _get_image_result(img)
+    return img
 
 
-def schedule_image(data: dict) -> BaseMessageComponent:
+def schedule_image(data: dict, theme: str = DEFAULT_THEME) -> BaseMessageComponent:
     """剑三活动日程图片生成"""
+    return _get_image_result(_draw_schedule(data, theme))
+
+
+def _draw_schedule(data: dict, theme: str = DEFAULT_THEME, transparent: bool = False) -> Image:
+    """绘制剑三活动日程画布
+
+    Args:
+        data: 剑三活动日程 json
+        theme: 主题名称
+        transparent: 是否使用透明背景(合并到其他画布时由外层绘制背景)
+
+    Returns:
+        Image: 画布
+    """
     # 配色方案保留原主题风格
-    theme_colors = {
+    theme_colors = get_colors(theme, "schedule", {
         "bg": "#F0F8FF",  # 背景
         "card_bg": "#FFFFFF",  # 卡片底色
         "border": "#87CEEB",  # 边框
@@ -269,7 +381,7 @@ def schedule_image(data: dict) -> BaseMessageComponent:
         "subtitle": "#338EF7",  # 副标题
         "content": "#182C45",  # 正文
         "time_color": "#99C7FB"  # 时间
-    }
+    })
 
     # 卡片布局参数
     card_width = 250
@@ -285,7 +397,7 @@ def schedule_image(data: dict) -> BaseMessageComponent:
     canvas_height = rows * card_height + (rows + 1) * card_margin
 
     # 创建画布
-    img = Image.new("RGB", (canvas_width, canvas_height), theme_colors["bg"])
+    img = _new_canvas(theme, (canvas_width, canvas_height), theme_colors["bg"], transparent)
     ImageDraw.Draw(img)
 
     # 字体配置（假设有支持中文的字体文件）
@@ -357,4 +469,49 @@ def schedule_image(data: dict) -> BaseMessageComponent:
         # 合并到主画布
         img.paste(card, (x, y))
 
+    return img
+
+
+def summary_image(
+        daily: Optional[dict], schedules: List[Tuple[str, list]], theme: str = DEFAULT_THEME
+) -> BaseMessageComponent:
+    """剑三汇总图片：日常信息与多个活动日程合并到同一画布
+
+    Args:
+        daily: 剑三日常信息 json，None 时不绘制
+        schedules: (标题, 剑三活动日程 json) 列表
+        theme: 主题名称
+
+    Returns:
+        BaseMessageComponent: 返回图片消息
+    """
+    default_colors = get_colors(theme, "summary", {
+        "bg": "#F0F8FF",  # 背景
+        "title": "#006FEE",  # 分区标题
+    })
+    title_height = 40  # 分区标题高度
+
+    # 按顺序收集各分区画布，分区不绘制背景，渐变与水印只在整张画布上绘制一次
+    sections = []
+    if daily is not None:
+        sections.append(("日常", _draw_daily_info(daily, theme, transparent=True)))
+    for title, data in schedules:
+        sections.append((title, _draw_schedule(data, theme, transparent=True)))
+
+    # 创建画布
+    canvas_width = max((section.width for _, section in sections), default=1)
+    canvas_height = max(sum(title_height + section.height for _, section in sections), 1)
+    img = _get_background(theme, (canvas_width, canvas_height), default_colors["bg"])
+    draw = ImageDraw.Draw(img)
+    font_title = _load_font(24)
+
+    # 纵向排列各分区，分区水平居中
+    y_offset = 0
+    for title, section in sections:
+        draw.text((15, y_offset + 8), title, fill=default_colors["title"], font=font_title)
+        y_offset += title_height
+        mask = section if section.mode == "RGBA" else None  # 透明背景的分区按透明度合并
+        img.paste(section, ((canvas_width - section.width) // 2, y_offset), mask)
+        y_offset += section.height
+
     return _get_image_result(img)
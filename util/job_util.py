@@ -1,17 +1,26 @@
 import asyncio
 from datetime import datetime
+from typing import Optional
 
 from croniter import croniter
 
 from astrbot.api import logger
+from .coord_util import Coordinator
 
 
 class CronSchedulerUtil:
     """ cron 定时任务调度"""
 
-    def __init__(self):
+    _lease_ttl = 24 * 60 * 60  # 单次执行租约有效期 1天
+
+    def __init__(self, coordinator: Optional[Coordinator] = None):
+        """
+        Args:
+            coordinator (Optional[Coordinator]): 多实例协调后端，存在时同一触发时间只有一个实例执行任务
+        """
         self.tasks = []  # 任务列表
         self.task_handles = []  # 任务句柄存储(启动的任务)
+        self._coordinator = coordinator
 
     def add_task(self, job_func, cron_expr, *args, **kwargs) -> None:
         """添加定时任务
@@ -45,8 +54,7 @@ class CronSchedulerUtil:
         handle = asyncio.create_task(self._cron_worker(job_func, cron_expr, *args, **kwargs))
         self.task_handles.append(handle)
 
-    @staticmethod
-    async def _cron_worker(job_func, cron_expr, *args, **kwargs) -> None:
+    async def _cron_worker(self, job_func, cron_expr, *args, **kwargs) -> None:
         """实际执行调度的协程
 
         Args:
@@ -66,6 +74,11 @@ class CronSchedulerUtil:
                 # 精准等待
                 if wait_seconds > 0:
                     await asyncio.sleep(wait_seconds)
+                # 多实例部署时按任务名+触发时间抢占租约，抢占失败说明已由其他实例执行
+                if self._coordinator is not None:
+                    lease_key = f"job:{job_func.__qualname__}:{next_time.isoformat()}"
+                    if not await self._coordinator.try_acquire(lease_key, self._lease_ttl):
+                        continue
                 asyncio.create_task(job_func(*args, **kwargs))  # 执行任务（并发执行）
             except asyncio.CancelledError:
                 break  # 任务被取消时退出
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional
+
+DEFAULT_THEME = "default"  # 默认主题(沿用各图片自带配色)
+
+# 主题配置
+#   bg: 背景渐变起止色，None 表示使用图片自带的纯色背景
+#   direction: 渐变方向 vertical(上->下) / horizontal(左->右)
+#   watermark: 右下角水印文字，None 表示不绘制
+#   colors: 按图片类型(calendar/daily/schedule/summary)覆盖的配色
+THEMES: Dict[str, dict] = {
+    "default": {
+        "bg": None,
+        "direction": "vertical",
+        "watermark": None,
+        "colors": {},
+    },
+    "樱花": {
+        "bg": ("#FFF0F5", "#FFD6E7"),
+        "direction": "vertical",
+        "watermark": "剑网3",
+        "colors": {
+            "calendar": {"border": "#F4A7C3", "date": "#C2185B"},
+            "daily": {"border": "#E91E63", "date": "#C2185B"},
+            "schedule": {"border": "#F4A7C3", "title": "#C2185B"},
+            "summary": {"title": "#C2185B"},
+        },
+    },
+    "青山": {
+        "bg": ("#F1F8E9", "#C5E1A5"),
+        "direction": "horizontal",
+        "watermark": "剑网3",
+        "colors": {
+            "calendar": {"border": "#8BC34A", "date": "#33691E"},
+            "daily": {"border": "#558B2F", "date": "#33691E"},
+            "schedule": {"border": "#8BC34A", "title": "#33691E"},
+            "summary": {"title": "#33691E"},
+        },
+    },
+}
+
+
+def theme_names() -> List[str]:
+    """获取所有主题名称
+
+    Returns:
+        List[str]: 主题名称列表
+    """
+    return list(THEMES)
+
+
+def get_theme(theme: str) -> dict:
+    """获取主题配置
+
+    Args:
+        theme (str): 主题名称
+
+    Returns:
+        dict: 主题配置，不存在时返回默认主题
+    """
+    return THEMES[resolve_theme(theme)]
+
+
+def get_colors(theme: str, kind: str, default_colors: dict) -> dict:
+    """获取主题覆盖后的配色
+
+    Args:
+        theme (str): 主题名称
+        kind (str): 图片类型
+        default_colors (dict): 图片自带配色
+
+    Returns:
+        dict: 合并后的配色
+    """
+    overrides = get_theme(theme)["colors"].get(kind, {})
+    return {**default_colors, **overrides}
+
+
+def resolve_theme(name: Optional[str]) -> str:
+    """校验主题名称，不存在时返回默认主题
+
+    Args:
+        name (Optional[str]): 主题名称
+
+    Returns:
+        str: 可用的主题名称
+    """
+    return name if name in THEMES else DEFAULT_THEME